@@ -58,7 +58,9 @@ __jina_env__ = (
     'JINA_LOG_LEVEL',
     'JINA_LOG_NO_COLOR',
     'JINA_LOG_WORKSPACE',
+    'JINA_MP_START_METHOD',
     'JINA_OPTIMIZER_TRIAL_WORKSPACE',
+    'JINA_PEA_PROCESS_POOL',
     'JINA_POD_NAME',
     'JINA_RANDOM_PORT_MAX',
     'JINA_RANDOM_PORT_MIN',
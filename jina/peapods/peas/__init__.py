@@ -1,21 +1,98 @@
 import argparse
+import atexit
+import concurrent.futures
+import functools
 import multiprocessing
 import os
+import pickle
 import threading
 import time
-from typing import Any, Tuple, Union, Dict
+import traceback
+from typing import Any, Tuple, Union, Dict, List, Optional, Iterable, Set
 
-from .helper import _get_event, ConditionalEvent
+from .helper import _get_event, _PeaStateFlags
 from ... import __stop_msg__, __ready_msg__, __default_host__, __docker_host__
 from ...enums import PeaRoleType, RuntimeBackendType, SocketType, GatewayProtocolType
 from ...excepts import RuntimeFailToStart, RuntimeRunForeverEarlyError
 from ...helper import typename
-from ...hubble.helper import is_valid_huburi
-from ...hubble.hubio import HubIO
 from ...logging.logger import JinaLogger
-from ...parsers.hubble import set_hub_pull_parser
 
-__all__ = ['BasePea']
+__all__ = ['BasePea', 'close_many']
+
+#: the lowercase prefixes of the URIs of the executors on the hub
+_HUB_URI_PREFIXES = ('jinahub://', 'jinahub+docker://')
+
+#: appended to the error messages unless ``--quiet-error`` is given
+_QUIET_ERR_SUFFIX = '\n add "--quiet-error" to suppress the exception details'
+
+#: the context of the Pea processes, set ``JINA_MP_START_METHOD=forkserver`` to fork them from a lean server process
+#: that preloads the runtimes, instead of from the main process which may have imported heavy libraries. Otherwise
+#: the default start method is kept undecided, so that user code can still set it after importing jina
+_MP_START_METHOD = os.environ.get('JINA_MP_START_METHOD')
+if _MP_START_METHOD and _MP_START_METHOD not in multiprocessing.get_all_start_methods():
+    from ...logging.predefined import default_logger
+
+    default_logger.warning(
+        f'JINA_MP_START_METHOD={_MP_START_METHOD!r} is not one of '
+        f'{multiprocessing.get_all_start_methods()}, the default start method is used'
+    )
+    _MP_START_METHOD = None
+_MP_CONTEXT = (
+    multiprocessing.get_context(_MP_START_METHOD)
+    if _MP_START_METHOD
+    else multiprocessing
+)
+if _MP_START_METHOD == 'forkserver':
+    _MP_CONTEXT.set_forkserver_preload(['jina.peapods.runtimes', 'jina.logging.logger'])
+
+#: the class of the worker that runs the runtime of a Pea, for each :class:`RuntimeBackendType`
+_BACKEND_CLS = {
+    RuntimeBackendType.THREAD: threading.Thread,
+    RuntimeBackendType.PROCESS: _MP_CONTEXT.Process,
+}
+
+#: the runtime of the gateway for each protocol
+_GATEWAY_RUNTIME_MAP = {
+    GatewayProtocolType.GRPC: 'GRPCRuntime',
+    GatewayProtocolType.WEBSOCKET: 'WebSocketRuntime',
+    GatewayProtocolType.HTTP: 'HTTPRuntime',
+}
+_GATEWAY_RUNTIME_SET = frozenset(_GATEWAY_RUNTIME_MAP.values())
+
+#: runtime classes resolved by :meth:`BasePea._get_runtime_cls`, keyed by their names
+_RUNTIME_CLS_CACHE = {}  # type: Dict[str, type]
+
+#: the threads shared by the Peas with the thread backend, created when it is used the first time
+_THREAD_POOL = None  # type: Optional[concurrent.futures.ThreadPoolExecutor]
+_THREAD_POOL_MAX_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+_THREAD_POOL_LOCK = threading.Lock()
+_thread_pool_busy = 0
+
+#: :mod:`jina.peapods.zmq`, imported the first time a control message is sent
+_ZMQ_MODULE = None
+
+
+@functools.lru_cache(maxsize=1024)
+def _get_tcp_ctrl_address(host: str, port_ctrl: int) -> str:
+    from ..zmq import Zmqlet
+
+    return Zmqlet.get_ctrl_address(host, port_ctrl, False)[0]
+
+
+def _get_ctrl_address(host: str, port_ctrl: int, ctrl_with_ipc: bool) -> str:
+    """Get the control address, the TCP ones are cached as they only depend on the arguments
+
+    :param host: the host of the control socket
+    :param port_ctrl: the control port
+    :param ctrl_with_ipc: whether using IPC protocol for controlling
+    :return: the control address
+    """
+    if ctrl_with_ipc:
+        from ..zmq import Zmqlet
+
+        # a new random IPC path every time, it must never be shared by two Peas
+        return Zmqlet.get_ctrl_address(host, port_ctrl, ctrl_with_ipc)[0]
+    return _get_tcp_ctrl_address(host, port_ctrl)
 
 
 def run(
@@ -25,10 +102,8 @@ def run(
     envs: Dict[str, str],
     timeout_ctrl: int,
     zed_runtime_ctrl_address: str,
-    is_started: Union['multiprocessing.Event', 'threading.Event'],
-    is_shutdown: Union['multiprocessing.Event', 'threading.Event'],
-    is_ready: Union['multiprocessing.Event', 'threading.Event'],
-    cancel_event: Union['multiprocessing.Event', 'threading.Event'],
+    state: '_PeaStateFlags',
+    logger: Optional['JinaLogger'] = None,
 ):
     """Method representing the :class:`BaseRuntime` activity.
 
@@ -52,51 +127,394 @@ def run(
     :param envs: a dictionary of environment variables to be set in the new Process
     :param timeout_ctrl: timeout time for the control port communication
     :param zed_runtime_ctrl_address: the control address of the `ZEDRuntime` that is supported by the Pea or `ContainerRuntime` or `JinadRuntime`.
-    :param is_started: concurrency event to communicate runtime is properly started. Used for better logging
-    :param is_shutdown: concurrency event to communicate runtime is terminated
-    :param is_ready: concurrency event to communicate runtime is ready to receive messages
-    :param cancel_event: concurrency event to receive cancelling signal from the Pea. Needed by some runtimes
+    :param state: the states shared with the Pea, to communicate runtime is properly started, ready to receive
+        messages or terminated, and to receive cancelling signal from the Pea
+    :param logger: the logger of the Pea, only given when `run` is in the same process as the Pea
     """
-    logger = JinaLogger(name, **vars(args))
+    logger = logger or JinaLogger(name, **vars(args))
+    is_thread = args.runtime_backend == RuntimeBackendType.THREAD
 
     def _unset_envs():
-        if envs and args.runtime_backend != RuntimeBackendType.THREAD:
-            for k in envs.keys():
-                os.unsetenv(k)
+        if envs and not is_thread:
+            # unlike `os.unsetenv`, this also keeps `os.environ` in sync
+            for k in envs:
+                os.environ.pop(k, None)
 
     def _set_envs():
-        if args.env:
-            if args.runtime_backend == RuntimeBackendType.THREAD:
-                logger.warning(
-                    'environment variables should not be set when runtime="thread".'
-                )
-            else:
-                os.environ.update({k: str(v) for k, v in envs.items()})
+        if not envs or not args.env:
+            return
+        if is_thread:
+            logger.warning(
+                'environment variables should not be set when runtime="thread".'
+            )
+        else:
+            for k, v in envs.items():
+                if os.environ.get(k) != v:
+                    os.environ[k] = v
 
     try:
         _set_envs()
         runtime = runtime_cls(
             args=args,
             ctrl_addr=zed_runtime_ctrl_address,
-            ready_event=is_ready,
-            cancel_event=cancel_event,
+            ready_event=state.event(_PeaStateFlags.READY),
+            cancel_event=state.event(_PeaStateFlags.CANCEL),
             timeout_ctrl=timeout_ctrl,
         )
     except Exception as ex:
+        suffix = '' if args.quiet_error else _QUIET_ERR_SUFFIX
         logger.error(
-            f'{ex!r} during {runtime_cls!r} initialization'
-            + f'\n add "--quiet-error" to suppress the exception details'
-            if not args.quiet_error
-            else '',
+            f'{ex!r} during {runtime_cls!r} initialization{suffix}',
             exc_info=not args.quiet_error,
         )
     else:
-        is_started.set()
+        state.set(_PeaStateFlags.STARTED)
         with runtime:
             runtime.run_forever()
     finally:
         _unset_envs()
-        is_shutdown.set()
+        state.set(_PeaStateFlags.SHUTDOWN)
+
+
+class _ThreadFutureWorker:
+    """A thin proxy with the interface of :class:`threading.Thread` that runs :meth:`run` in a shared thread pool.
+
+    A runtime holds its thread for its whole lifetime. Hence if all threads of the pool are busy, it falls back to a
+    dedicated :class:`threading.Thread` instead of queueing the Pea behind the runtimes that never finish.
+
+    :param kwargs: the kwargs of :meth:`run`
+    """
+
+    def __init__(self, kwargs: Dict):
+        self._kwargs = kwargs
+        self._future = None  # type: Optional[concurrent.futures.Future]
+        self._thread = None  # type: Optional[threading.Thread]
+
+    def start(self):
+        """Submit :meth:`run` to the shared thread pool"""
+        global _THREAD_POOL, _thread_pool_busy
+        with _THREAD_POOL_LOCK:
+            if _thread_pool_busy < _THREAD_POOL_MAX_WORKERS:
+                if _THREAD_POOL is None:
+                    _THREAD_POOL = concurrent.futures.ThreadPoolExecutor(
+                        max_workers=_THREAD_POOL_MAX_WORKERS,
+                        thread_name_prefix='pea',
+                    )
+                _thread_pool_busy += 1
+                self._future = _THREAD_POOL.submit(self._run)
+                return
+        self._thread = threading.Thread(target=run, kwargs=self._kwargs)
+        self._thread.start()
+
+    def _run(self):
+        global _thread_pool_busy
+        try:
+            run(**self._kwargs)
+        except BaseException:
+            # keep the traceback visible as :class:`threading.Thread` does
+            traceback.print_exc()
+        finally:
+            with _THREAD_POOL_LOCK:
+                _thread_pool_busy -= 1
+
+    def is_alive(self) -> bool:
+        """Check if :meth:`run` is still running
+
+        .. # noqa: DAR201"""
+        if self._thread:
+            return self._thread.is_alive()
+        return self._future is not None and not self._future.done()
+
+    def join(self, timeout: Optional[float] = None):
+        """Wait until :meth:`run` has finished
+
+        :param timeout: the timeout in seconds
+        """
+        if self._thread:
+            self._thread.join(timeout)
+        elif self._future:
+            concurrent.futures.wait([self._future], timeout)
+
+    def terminate(self):
+        """Threads can not be terminated, this is a no-op to keep the interface of :class:`multiprocessing.Process`"""
+
+
+def _dispatch_jobs(
+    jobs: 'multiprocessing.SimpleQueue',
+    state: '_PeaStateFlags',
+    is_idle: 'multiprocessing.Event',
+):
+    """The dispatch loop of :class:`_PooledProcess`, it runs :meth:`run` for every job until it receives None
+
+    :param jobs: the queue of the kwargs of :meth:`run` without the states
+    :param state: the states shared with the Peas that are dispatched to this process
+    :param is_idle: set once a job is finished, i.e. the process will not touch the states anymore
+    """
+    while True:
+        try:
+            job = jobs.get()
+        except Exception as ex:
+            # the job can not be unpickled in this process, e.g. it refers to a class defined after the fork
+            JinaLogger(_PooledProcess.__name__).error(
+                f'{ex!r} during receiving the job of this process'
+            )
+            state.set(_PeaStateFlags.SHUTDOWN)
+            is_idle.set()
+            continue
+        if job is None:
+            break
+        environ = dict(os.environ)
+        run(**job, state=state)
+        # the next Pea must not see the envs of this one
+        os.environ.clear()
+        os.environ.update(environ)
+        is_idle.set()
+
+
+class _PooledProcess:
+    """A long-lived process of :data:`_MP_CONTEXT` that runs :meth:`run` for one :class:`BasePea` at a time.
+
+    The states are created with the process and shared with it once, so that they can be reused by every Pea that
+    is dispatched to this process. Jobs are the pickled kwargs of :meth:`run` without the states.
+    """
+
+    def __init__(self):
+        self._jobs = _MP_CONTEXT.SimpleQueue()
+        self.state = _PeaStateFlags(_MP_CONTEXT.Process)
+        self._is_idle = _get_event(_MP_CONTEXT.Process)
+        self._is_idle.set()
+        self._process = _MP_CONTEXT.Process(
+            target=_dispatch_jobs, args=(self._jobs, self.state, self._is_idle)
+        )
+        self._process.start()
+
+    @property
+    def pid(self) -> Optional[int]:
+        """Get the pid of the pooled process
+
+
+        .. # noqa: DAR201"""
+        return self._process.pid
+
+    def is_alive(self) -> bool:
+        """Check if the pooled process is still alive
+
+
+        .. # noqa: DAR201"""
+        return self._process.is_alive()
+
+    def submit(self, kwargs: Dict):
+        """Submit kwargs of :meth:`run` to the pooled process
+
+        :param kwargs: the kwargs of :meth:`run` without the states, they must be picklable
+        """
+        self._is_idle.clear()
+        try:
+            self._jobs.put(kwargs)
+        except:
+            self._is_idle.set()
+            raise
+
+    def reset(self, timeout: float = 1.0) -> bool:
+        """Clear the states so that the process can be handed to another Pea
+
+        :param timeout: the time in seconds to wait for the process to finish its current job
+        :return: True if the process is idle and its states are cleared
+        """
+        if not self._is_idle.wait(timeout):
+            return False
+        self.state.clear()
+        return True
+
+    def stop(self):
+        """Ask the pooled process to exit once it is idle"""
+        self._jobs.put(None)
+
+    def terminate(self):
+        """Terminate the pooled process immediately"""
+        self._process.terminate()
+
+
+class _PeaProcessPool:
+    """A pool of pre-forked :class:`_PooledProcess`, shared by all the Peas of this process.
+
+    Creating a :class:`multiprocessing.Process` for every Pea is the dominant cost of starting Flows with many Peas.
+    The pool forks ``os.cpu_count()`` processes when the first Pea is started and hands idle ones to new Peas, more
+    processes are forked on demand when none is idle. The processes that are still acquired at exit, e.g. by Peas
+    that failed to start and were never closed, are stopped or terminated so that the interpreter can exit.
+
+    .. warning::
+        A pooled process only knows about the modules, classes and environment variables of the main process at the
+        time when it was forked. Hence it is only enabled when ``JINA_PEA_PROCESS_POOL`` is set.
+
+    :param size: the number of processes that are forked in advance and kept idle
+    """
+
+    _instance = None  # type: Optional['_PeaProcessPool']
+
+    def __init__(self, size: int):
+        self._size = size
+        self._idle = []  # type: List[_PooledProcess]
+        self._busy = set()  # type: Set[_PooledProcess]
+        self._lock = threading.Lock()
+        self._is_warm = False
+        # registered after the exit handler of `multiprocessing`, so that it runs before the processes are joined
+        import multiprocessing.util
+
+        atexit.register(self.close)
+
+    @classmethod
+    def get(cls) -> '_PeaProcessPool':
+        """Get the pool of this process, create it when it is used the first time
+
+        .. # noqa: DAR201"""
+        if cls._instance is None:
+            cls._instance = cls(os.cpu_count() or 1)
+        return cls._instance
+
+    def acquire(self) -> '_PooledProcess':
+        """Get an idle process from the pool
+
+        .. # noqa: DAR201"""
+        with self._lock:
+            if not self._is_warm:
+                self._idle.extend(_PooledProcess() for _ in range(self._size))
+                self._is_warm = True
+            while self._idle:
+                p = self._idle.pop()
+                if p.is_alive():
+                    break
+            else:
+                p = _PooledProcess()
+            self._busy.add(p)
+        return p
+
+    def release(self, p: '_PooledProcess'):
+        """Give the process back to the pool once its Pea is finished
+
+        :param p: the process to give back
+        """
+        self.discard(p)
+        if not p.is_alive():
+            return
+        if not p.reset():
+            p.terminate()
+            return
+        with self._lock:
+            if len(self._idle) < self._size:
+                self._idle.append(p)
+                return
+        p.stop()
+
+    def discard(self, p: '_PooledProcess'):
+        """Forget a process that is acquired, e.g. because it was terminated
+
+        :param p: the process to forget
+        """
+        with self._lock:
+            self._busy.discard(p)
+
+    def close(self):
+        """Ask all processes to exit, the ones that are still running a Pea are terminated"""
+        with self._lock:
+            for p in self._idle:
+                p.stop()
+            for p in self._busy:
+                if p.reset(timeout=0):
+                    p.stop()
+                else:
+                    p.terminate()
+            self._idle.clear()
+            self._busy.clear()
+
+
+class _PooledWorker:
+    """A thin proxy with the interface of :class:`multiprocessing.Process` that runs :meth:`run` in a pooled process.
+
+    The process is acquired from the pool when the worker is started. If the kwargs of :meth:`run` can not be
+    pickled, e.g. when the runtime is a local class, it falls back to fork a new process that shares the states of
+    the pooled process.
+
+    :param pool: the pool that owns the process
+    :param kwargs: the kwargs of :meth:`run` without the states
+    """
+
+    def __init__(self, pool: '_PeaProcessPool', kwargs: Dict):
+        self._pool = pool
+        self._kwargs = kwargs
+        self._process = None  # type: Optional[_PooledProcess]
+        self._fallback = None  # type: Optional[multiprocessing.Process]
+        self._released = False
+        # the states before a process is acquired, nothing sets them
+        self._unstarted_state = _PeaStateFlags()
+
+    @property
+    def state(self) -> '_PeaStateFlags':
+        """Get the states shared with the pooled process, they change once the worker is started
+
+
+        .. # noqa: DAR201"""
+        return self._process.state if self._process else self._unstarted_state
+
+    @property
+    def pid(self) -> Optional[int]:
+        """Get the pid of the process running :meth:`run`
+
+
+        .. # noqa: DAR201"""
+        if self._fallback:
+            return self._fallback.pid
+        return self._process.pid if self._process else None
+
+    def start(self):
+        """Acquire a process from the pool and submit :meth:`run` to it"""
+        self._process = self._pool.acquire()
+        try:
+            self._process.submit(self._kwargs)
+        except (pickle.PicklingError, AttributeError, TypeError):
+            self._fallback = _MP_CONTEXT.Process(
+                target=run, kwargs={**self._kwargs, 'state': self.state}
+            )
+            self._fallback.start()
+
+    def is_alive(self) -> bool:
+        """Check if :meth:`run` is still running
+
+        .. # noqa: DAR201"""
+        if self._fallback:
+            return self._fallback.is_alive()
+        return (
+            self._process is not None
+            and self._process.is_alive()
+            and not self.state.is_set(_PeaStateFlags.SHUTDOWN)
+        )
+
+    def join(self, timeout: Optional[float] = None):
+        """Wait until :meth:`run` has finished and give the process back to the pool
+
+        :param timeout: the timeout in seconds
+        """
+        if self._fallback:
+            self._fallback.join(timeout)
+        elif self._process:
+            self.state.wait_any(_PeaStateFlags.SHUTDOWN, timeout)
+        self.release()
+
+    def release(self):
+        """Give the process back to the pool if :meth:`run` has finished, otherwise it is a no-op"""
+        if self._released or self._process is None or self.is_alive():
+            return
+        self._released = True
+        self._pool.release(self._process)
+
+    def terminate(self):
+        """Terminate the process running :meth:`run`, a terminated pooled process is never reused"""
+        if self._fallback:
+            self._fallback.terminate()
+        elif self._process and not self._released:
+            self._released = True
+            self._process.terminate()
+            self._pool.discard(self._process)
 
 
 class BasePea:
@@ -107,6 +525,27 @@ class BasePea:
     A :class:`BasePea` must be equipped with a proper :class:`Runtime` class to work.
     """
 
+    # a Flow may hold many Peas, subclasses without their own `__slots__` still get a `__dict__`
+    __slots__ = (
+        'args',
+        'name',
+        'logger',
+        '_envs',
+        'runtime_cls',
+        '_timeout_ctrl',
+        '_zed_runtime_ctrl_address',
+        '_state',
+        'worker',
+        'is_ready',
+        'is_shutdown',
+        'cancel_event',
+        'is_started',
+        'daemon',
+        '_close_state',
+        '_is_dealer_cached',
+        '_is_inner_pea_cached',
+    )
+
     def __init__(self, args: 'argparse.Namespace'):
         super().__init__()  #: required here to call process/thread __init__
         self.args = args
@@ -114,7 +553,8 @@ class BasePea:
 
         self.logger = JinaLogger(self.name, **vars(self.args))
 
-        if self.args.runtime_backend == RuntimeBackendType.THREAD:
+        backend = getattr(args, 'runtime_backend', RuntimeBackendType.THREAD)
+        if backend == RuntimeBackendType.THREAD:
             self.logger.warning(
                 f' Using Thread as runtime backend is not recommended for production purposes. It is '
                 f'just supposed to be used for easier debugging. Besides the performance considerations, it is'
@@ -126,6 +566,8 @@ class BasePea:
             self._envs['JINA_LOG_CONFIG'] = 'QUIET'
         if self.args.env:
             self._envs.update(self.args.env)
+        # converted once here, so that `run` can set them as they are
+        self._envs = {k: str(v) for k, v in self._envs.items()}
 
         # arguments needed to create `runtime` and communicate with it in the `run` in the stack of the new process
         # or thread. Control address from Zmqlet has some randomness and therefore we need to make sure Pea knows
@@ -133,43 +575,51 @@ class BasePea:
         self.runtime_cls = self._get_runtime_cls()
         self._timeout_ctrl = self.args.timeout_ctrl
         self._set_ctrl_adrr()
-        test_worker = {
-            RuntimeBackendType.THREAD: threading.Thread,
-            RuntimeBackendType.PROCESS: multiprocessing.Process,
-        }.get(getattr(args, 'runtime_backend', RuntimeBackendType.THREAD))()
-        self.is_ready = _get_event(test_worker)
-        self.is_shutdown = _get_event(test_worker)
-        self.cancel_event = _get_event(test_worker)
-        self.is_started = _get_event(test_worker)
-        self.ready_or_shutdown = ConditionalEvent(
-            getattr(args, 'runtime_backend', RuntimeBackendType.THREAD),
-            events_list=[self.is_ready, self.is_shutdown],
-        )
-        self.worker = {
-            RuntimeBackendType.THREAD: threading.Thread,
-            RuntimeBackendType.PROCESS: multiprocessing.Process,
-        }.get(getattr(args, 'runtime_backend', RuntimeBackendType.THREAD))(
-            target=run,
-            kwargs={
-                'args': args,
-                'name': self.name,
-                'envs': self._envs,
-                'is_started': self.is_started,
-                'is_shutdown': self.is_shutdown,
-                'is_ready': self.is_ready,
-                'cancel_event': self.cancel_event,
-                'timeout_ctrl': self._timeout_ctrl,
-                'zed_runtime_ctrl_address': self._zed_runtime_ctrl_address,
-                'runtime_cls': self.runtime_cls,
-            },
-        )
+        # arguments needed to create `runtime` in the `run`, the states are given by the worker
+        kwargs = {
+            'args': args,
+            'name': self.name,
+            'envs': self._envs,
+            'timeout_ctrl': self._timeout_ctrl,
+            'zed_runtime_ctrl_address': self._zed_runtime_ctrl_address,
+            'runtime_cls': self.runtime_cls,
+        }
+        if (
+            backend == RuntimeBackendType.PROCESS
+            and 'JINA_PEA_PROCESS_POOL' in os.environ
+        ):
+            self.worker = _PooledWorker(_PeaProcessPool.get(), kwargs)
+            state = self.worker.state
+        else:
+            worker_cls = _BACKEND_CLS[backend]
+            state = kwargs['state'] = _PeaStateFlags(worker_cls)
+            if backend == RuntimeBackendType.THREAD:
+                # a logger of the same context in the same process would only rebuild the same handlers
+                kwargs['logger'] = self.logger
+                self.worker = _ThreadFutureWorker(kwargs)
+            else:
+                self.worker = worker_cls(target=run, kwargs=kwargs)
+        self._bind_state(state)
         self.daemon = self.args.daemon  #: required here to set process/thread daemon
+        #: the ``(is_ready, is_shutdown)`` states read by :meth:`close_async` for :meth:`close_wait`
+        self._close_state = None  # type: Optional[Tuple[bool, bool]]
+        self._is_dealer_cached = self.args.socket_in == SocketType.DEALER_CONNECT
+        self._is_inner_pea_cached = self.args.pea_role in (
+            PeaRoleType.SINGLETON,
+            PeaRoleType.PARALLEL,
+        )
+
+    def _bind_state(self, state: '_PeaStateFlags'):
+        self._state = state
+        self.is_ready = state.event(_PeaStateFlags.READY)
+        self.is_shutdown = state.event(_PeaStateFlags.SHUTDOWN)
+        self.cancel_event = state.event(_PeaStateFlags.CANCEL)
+        self.is_started = state.event(_PeaStateFlags.STARTED)
 
     def _set_ctrl_adrr(self):
         """Sets control address for different runtimes"""
         # This logic must be improved specially when it comes to naming. It is about relative local/remote position
         # between the runtime and the `ZEDRuntime` it may control
-        from ..zmq import Zmqlet
         from ..runtimes.container import ContainerRuntime
 
         if self.runtime_cls == ContainerRuntime:
@@ -186,13 +636,13 @@ class BasePea:
             else:
                 ctrl_host = self.args.host
 
-            self._zed_runtime_ctrl_address = Zmqlet.get_ctrl_address(
+            self._zed_runtime_ctrl_address = _get_ctrl_address(
                 ctrl_host, self.args.port_ctrl, self.args.ctrl_with_ipc
-            )[0]
+            )
         else:
-            self._zed_runtime_ctrl_address = Zmqlet.get_ctrl_address(
+            self._zed_runtime_ctrl_address = _get_ctrl_address(
                 self.args.host, self.args.port_ctrl, self.args.ctrl_with_ipc
-            )[0]
+            )
 
     def start(self):
         """Start the Pea.
@@ -200,6 +650,9 @@ class BasePea:
         .. #noqa: DAR201
         """
         self.worker.start()
+        if isinstance(self.worker, _PooledWorker):
+            # the pooled process, hence the states, is only acquired when the worker is started
+            self._bind_state(self.worker.state)
         if not self.args.noblock_on_start:
             self.wait_start_success()
         return self
@@ -221,12 +674,16 @@ class BasePea:
             self.worker.terminate()
 
     def _retry_control_message(self, command: str, num_retry: int = 3):
-        from ..zmq import send_ctrl_message
+        global _ZMQ_MODULE
+        if _ZMQ_MODULE is None:
+            from .. import zmq as _ZMQ_MODULE
 
+        prefix = f'Sending {command} command'
         for retry in range(1, num_retry + 1):
-            self.logger.debug(f'Sending {command} command for the {retry}th time')
+            if self.logger.debug_enabled:
+                self.logger.debug(f'{prefix} for the {retry}th time')
             try:
-                send_ctrl_message(
+                _ZMQ_MODULE.send_ctrl_message(
                     self._zed_runtime_ctrl_address,
                     command,
                     timeout=self._timeout_ctrl,
@@ -235,8 +692,12 @@ class BasePea:
                 break
             except Exception as ex:
                 self.logger.warning(f'{ex!r}')
+                if self.is_shutdown.is_set():
+                    # the runtime is gone, there is nobody left to receive the command
+                    break
                 if retry == num_retry:
                     raise ex
+                time.sleep(min(0.05 * 2 ** (retry - 1), 0.5))
 
     def activate_runtime(self):
         """ Send activate control message. """
@@ -269,7 +730,9 @@ class BasePea:
         else:
             _timeout /= 1e3
         self.logger.debug('waiting for ready or shutdown signal from runtime')
-        if self.ready_or_shutdown.event.wait(_timeout):
+        if self._state.wait_any(
+            _PeaStateFlags.READY | _PeaStateFlags.SHUTDOWN, _timeout
+        ):
             if self.is_shutdown.is_set():
                 # return too early and the shutdown is set, means something fails!!
                 if not self.is_started.is_set():
@@ -294,38 +757,68 @@ class BasePea:
         """Return true if this `Pea` must act as a Dealer responding to a Router
         .. # noqa: DAR201
         """
-        return self.args.socket_in == SocketType.DEALER_CONNECT
+        return self._is_dealer_cached
 
-    def close(self) -> None:
-        """Close the Pea
+    def close_async(self) -> None:
+        """Ask the runtime to shut down without waiting for the shutdown
 
-        This method makes sure that the `Process/thread` is properly finished and its resources properly released
+        Must be followed by :meth:`close_wait`, it allows to shut down many Peas concurrently, see :func:`close_many`.
+        Note that the control messages to deactivate and cancel the runtime are still sent one by one, each of them
+        waits for its reply.
         """
-        # if that 1s is not enough, it means the process/thread is still in forever loop, cancel it
         self.logger.debug('waiting for ready or shutdown signal from runtime')
-        if self.is_ready.is_set() and not self.is_shutdown.is_set():
+        # read the events once, the same states decide how the Pea is closed in `close_wait`
+        ready, shut = self._close_state = (
+            self.is_ready.is_set(),
+            self.is_shutdown.is_set(),
+        )
+        if ready and not shut:
             try:
                 self._deactivate_runtime()
                 self._cancel_runtime()
-                if not self.is_shutdown.wait(timeout=self._timeout_ctrl):
+            except Exception as ex:
+                suffix = '' if self.args.quiet_error else _QUIET_ERR_SUFFIX
+                self.logger.error(
+                    f'{ex!r} during {self.close!r}{suffix}',
+                    exc_info=not self.args.quiet_error,
+                )
+
+    def close_wait(self, deadline: Optional[float] = None) -> None:
+        """Wait until the runtime asked by :meth:`close_async` is shutdown and release the resources of the Pea
+
+        :param deadline: the :func:`time.monotonic` time to wait the ready or shutdown signal until, before
+            terminating the Pea. By default it waits for `timeout_ctrl`, or for `timeout_ready` if it is not ready
+        """
+        try:
+            self._close_wait(deadline)
+        finally:
+            if isinstance(self.worker, _PooledWorker):
+                # the pooled process outlives the Pea, e.g. its runtime failed or it is a daemon, give it back if it is done
+                self.worker.release()
+            self.logger.debug(__stop_msg__)
+            self.logger.close()
+
+    def _close_wait(self, deadline: Optional[float]) -> None:
+        state, self._close_state = self._close_state, None
+        ready, shut = state or (self.is_ready.is_set(), self.is_shutdown.is_set())
+        if ready and not shut:
+            _timeout = _time_left(deadline, self._timeout_ctrl)
+            try:
+                if not self.is_shutdown.wait(timeout=_timeout):
                     self.terminate()
                     time.sleep(0.1)
-                    raise Exception(
-                        f'Shutdown signal was not received for {self._timeout_ctrl}'
-                    )
+                    raise Exception(f'Shutdown signal was not received for {_timeout}')
             except Exception as ex:
+                suffix = '' if self.args.quiet_error else _QUIET_ERR_SUFFIX
                 self.logger.error(
-                    f'{ex!r} during {self.close!r}'
-                    + f'\n add "--quiet-error" to suppress the exception details'
-                    if not self.args.quiet_error
-                    else '',
+                    f'{ex!r} during {self.close!r}{suffix}',
                     exc_info=not self.args.quiet_error,
                 )
 
             # if it is not daemon, block until the process/thread finish work
             if not self.args.daemon:
                 self.join()
-        elif self.is_shutdown.is_set():
+        elif shut:
             # here shutdown has been set already, therefore `run` will gracefully finish
             pass
         else:
@@ -341,14 +834,18 @@ class BasePea:
             else:
                 _timeout /= 1e3
             self.logger.debug('waiting for ready or shutdown signal from runtime')
-            if self.ready_or_shutdown.event.wait(_timeout):
+            if self._state.wait_any(
+                _PeaStateFlags.READY | _PeaStateFlags.SHUTDOWN,
+                _time_left(deadline, _timeout),
+            ):
                 if self.is_ready.is_set():
                     self._cancel_runtime()
-                    if not self.is_shutdown.wait(timeout=self._timeout_ctrl):
+                    _timeout = _time_left(deadline, self._timeout_ctrl)
+                    if not self.is_shutdown.wait(timeout=_timeout):
                         self.terminate()
                         time.sleep(0.1)
                         raise Exception(
-                            f'Shutdown signal was not received for {self._timeout_ctrl}'
+                            f'Shutdown signal was not received for {_timeout}'
                         )
             else:
                 self.logger.warning(
@@ -357,8 +854,14 @@ class BasePea:
                 # Just last resource, terminate it
                 self.terminate()
                 time.sleep(0.1)
-        self.logger.debug(__stop_msg__)
-        self.logger.close()
+
+    def close(self) -> None:
+        """Close the Pea
+
+        This method makes sure that the `Process/thread` is properly finished and its resources properly released
+        """
+        self.close_async()
+        self.close_wait()
 
     def __enter__(self):
         return self.start()
@@ -367,13 +870,8 @@ class BasePea:
         self.close()
 
     def _get_runtime_cls(self) -> Tuple[Any, bool]:
-        gateway_runtime_dict = {
-            GatewayProtocolType.GRPC: 'GRPCRuntime',
-            GatewayProtocolType.WEBSOCKET: 'WebSocketRuntime',
-            GatewayProtocolType.HTTP: 'HTTPRuntime',
-        }
         if (
-            self.args.runtime_cls not in gateway_runtime_dict.values()
+            self.args.runtime_cls not in _GATEWAY_RUNTIME_SET
             and self.args.host != __default_host__
             and not self.args.disable_remote
         ):
@@ -385,17 +883,32 @@ class BasePea:
             'docker://'
         ):
             self.args.runtime_cls = 'ContainerRuntime'
-        if self.args.runtime_cls == 'ZEDRuntime' and is_valid_huburi(self.args.uses):
-            self.args.uses = HubIO(
-                set_hub_pull_parser().parse_args([self.args.uses, '--no-usage'])
-            ).pull()
-            if self.args.uses.startswith('docker://'):
-                self.args.runtime_cls = 'ContainerRuntime'
+        if self.args.runtime_cls == 'ZEDRuntime' and self.args.uses.lower().startswith(
+            _HUB_URI_PREFIXES
+        ):
+            # the hub modules are only needed for pulling the executors, the scheme is case-insensitive as in
+            # `parse_hub_uri`
+            from ...hubble.helper import is_valid_huburi
+
+            if is_valid_huburi(self.args.uses):
+                from ...hubble.hubio import HubIO
+                from ...parsers.hubble import set_hub_pull_parser
+
+                self.args.uses = HubIO(
+                    set_hub_pull_parser().parse_args([self.args.uses, '--no-usage'])
+                ).pull()
+                if self.args.uses.startswith('docker://'):
+                    self.args.runtime_cls = 'ContainerRuntime'
         if hasattr(self.args, 'protocol'):
-            self.args.runtime_cls = gateway_runtime_dict[self.args.protocol]
-        from ..runtimes import get_runtime
+            self.args.runtime_cls = _GATEWAY_RUNTIME_MAP[self.args.protocol]
+
+        runtime_cls = _RUNTIME_CLS_CACHE.get(self.args.runtime_cls)
+        if runtime_cls is None:
+            from ..runtimes import get_runtime
 
-        return get_runtime(self.args.runtime_cls)
+            runtime_cls = get_runtime(self.args.runtime_cls)
+            _RUNTIME_CLS_CACHE[self.args.runtime_cls] = runtime_cls
+        return runtime_cls
 
     @property
     def role(self) -> 'PeaRoleType':
@@ -411,4 +924,42 @@ class BasePea:
 
 
         .. #noqa: DAR201"""
-        return self.role is PeaRoleType.SINGLETON or self.role is PeaRoleType.PARALLEL
+        return self._is_inner_pea_cached
+
+
+def _time_left(deadline: Optional[float], timeout: Optional[float]) -> Optional[float]:
+    """Get the time to wait, the deadline replaces the timeout if there is one
+
+    :param deadline: the :func:`time.monotonic` time to wait until, or None
+    :param timeout: the timeout in seconds when there is no deadline, None waits forever
+    :return: the timeout in seconds
+    """
+    if deadline is None:
+        return timeout
+    return max(deadline - time.monotonic(), 0)
+
+
+def close_many(peas: Iterable['BasePea'], timeout: Optional[float] = None) -> None:
+    """Close many Peas concurrently
+
+    All the Peas are asked to shut down first and then waited for with a shared deadline, hence closing N Peas takes
+    about as long as closing the slowest one instead of the sum of them. The Peas that are not shutdown when the
+    deadline passes are terminated. A Pea failing to close does not stop the others from being closed.
+
+    :param peas: the Peas to close
+    :param timeout: the time in seconds shared by all the Peas to shut down, by default each Pea waits for its
+        `timeout_ctrl`, or for `timeout_ready` if it is not ready
+    :raises Exception: the first error raised by :meth:`BasePea.close_wait`, once all the Peas are closed
+    """
+    peas = list(peas)
+    for p in peas:
+        p.close_async()
+    deadline = None if timeout is None else time.monotonic() + timeout
+    errors = []
+    for p in peas:
+        try:
+            p.close_wait(deadline)
+        except Exception as ex:
+            errors.append(ex)
+    if errors:
+        raise errors[0]
@@ -1,68 +1,149 @@
 import multiprocessing
 import threading
-from functools import partial
-from typing import Union
+from ctypes import c_ubyte
+from typing import Union, Optional
 
 from ...enums import RuntimeBackendType
 
 
-def _get_event(obj) -> Union[multiprocessing.Event, threading.Event]:
-    if isinstance(obj, threading.Thread):
-        return threading.Event()
-    elif isinstance(obj, multiprocessing.Process) or isinstance(
-        obj, multiprocessing.context.ForkProcess
+def _get_worker_cls(backend: Union[RuntimeBackendType, type]) -> type:
+    if backend == RuntimeBackendType.THREAD:
+        return threading.Thread
+    elif backend == RuntimeBackendType.PROCESS:
+        return multiprocessing.Process
+    elif isinstance(backend, type) and issubclass(
+        backend, (threading.Thread, multiprocessing.process.BaseProcess)
     ):
-        return multiprocessing.Event()
-    elif isinstance(obj, multiprocessing.context.SpawnProcess):
-        return multiprocessing.get_context('spawn').Event()
+        # covers `multiprocessing.Process` and the processes of the fork/spawn/forkserver contexts
+        return backend
     else:
         raise TypeError(
-            f'{obj} is not an instance of "threading.Thread" nor "multiprocessing.Process"'
+            f'{backend} is neither a "RuntimeBackendType" nor a subclass of "threading.Thread" or '
+            f'"multiprocessing.Process"'
         )
 
 
-class ConditionalEvent:
+def _get_event(
+    backend: Union[RuntimeBackendType, type]
+) -> Union[multiprocessing.Event, threading.Event]:
+    """Get an event that can be shared with the workers of the given backend
+
+    :param backend: the :class:`RuntimeBackendType`, or the class of the worker, i.e. :class:`threading.Thread` or
+        one of :class:`multiprocessing.Process` and the processes of the fork/spawn/forkserver contexts
+    :return: the event
+    """
+    worker_cls = _get_worker_cls(backend)
+    if issubclass(worker_cls, threading.Thread):
+        return threading.Event()
+    return multiprocessing.get_context(worker_cls._start_method).Event()
+
+
+class _PeaStateFlags:
     """
-    :class:`ConditionalEvent` provides a common interface to an event (multiprocessing or threading event)
-    that gets triggered when any of the events provided in input is triggered (OR logic)
+    :class:`_PeaStateFlags` holds the states of a Pea as the bits of a single byte shared with its worker.
 
-    :param backend_runtime: The runtime type to decide which type of Event to instantiate
-    :param events_list: The list of events that compose this composable event
+    It replaces one event per state: setting or clearing bits is done under a single condition, which also wakes up the
+    waiters, and reading the states is a plain read of the byte. Waiting on many states at once is a single
+    :meth:`wait_any`, no extra event is needed.
+
+    :param backend: the :class:`RuntimeBackendType`, or the class of the worker, see :func:`_get_event`
     """
 
-    def __init__(self, backend_runtime: RuntimeBackendType, events_list):
-        super().__init__()
-        self.event = None
-        if backend_runtime == RuntimeBackendType.THREAD:
-            self.event = threading.Event()
-        else:
-            self.event = multiprocessing.synchronize.Event(
-                ctx=multiprocessing.get_context()
-            )
-        self.event_list = events_list
-        for e in events_list:
-            self._setup(e, self._state_changed)
-
-        self._state_changed()
-
-    def _state_changed(self):
-        bools = [e.is_set() for e in self.event_list]
-        if any(bools):
-            self.event.set()
+    READY = 1
+    SHUTDOWN = 2
+    CANCEL = 4
+    STARTED = 8
+
+    def __init__(
+        self, backend: Union[RuntimeBackendType, type] = RuntimeBackendType.THREAD
+    ):
+        worker_cls = _get_worker_cls(backend)
+        if issubclass(worker_cls, threading.Thread):
+            self._value = c_ubyte(0)
+            self._cond = threading.Condition()
         else:
-            self.event.clear()
-
-    def _custom_set(self, e):
-        e._set()
-        e._state_changed()
-
-    def _custom_clear(self, e):
-        e._clear()
-        e._state_changed()
-
-    def _setup(self, e, changed_callback):
-        e._set = e.set
-        e._clear = e.clear
-        e._state_changed = changed_callback
-        e.set = partial(self._custom_set, e)
-        e.clear = partial(self._custom_clear, e)
+            ctx = multiprocessing.get_context(worker_cls._start_method)
+            # the byte is only written under `_cond`, hence it needs no lock of its own
+            self._value = ctx.RawValue('B', 0)
+            self._cond = ctx.Condition()
+
+    def is_set(self, bits: int) -> bool:
+        """Check if any of the given bits is set
+
+        :param bits: the states to check, e.g. ``READY | SHUTDOWN``
+        :return: True if any of them is set
+        """
+        return bool(self._value.value & bits)
+
+    def set(self, bits: int):
+        """Set the given bits and wake up all the waiters
+
+        :param bits: the states to set
+        """
+        if self._value.value & bits == bits:
+            return
+        with self._cond:
+            self._value.value |= bits
+            self._cond.notify_all()
+
+    def clear(self, bits: int = 0xFF):
+        """Clear the given bits
+
+        :param bits: the states to clear, all of them by default
+        """
+        with self._cond:
+            self._value.value &= ~bits & 0xFF
+
+    def wait_any(self, bits: int, timeout: Optional[float] = None) -> bool:
+        """Block until any of the given bits is set
+
+        :param bits: the states to wait on, e.g. ``READY | SHUTDOWN``
+        :param timeout: the timeout in seconds, wait forever if it is None
+        :return: True if any of them is set before the timeout
+        """
+        if self._value.value & bits:
+            return True
+        with self._cond:
+            return bool(self._cond.wait_for(lambda: self._value.value & bits, timeout))
+
+    def event(self, bit: int) -> '_PeaStateEvent':
+        """Get an event-like view of one state, for the runtimes expecting an event
+
+        :param bit: the state of the view
+        :return: the view
+        """
+        return _PeaStateEvent(self, bit)
+
+
+class _PeaStateEvent:
+    """A view of one state of :class:`_PeaStateFlags`, the interface follows :class:`multiprocessing.Event`
+
+    :param flags: the states of the Pea
+    :param bit: the state of this view
+    """
+
+    def __init__(self, flags: '_PeaStateFlags', bit: int):
+        self._flags = flags
+        self._bit = bit
+
+    def is_set(self) -> bool:
+        """Check if the state is set
+
+        .. # noqa: DAR201"""
+        return self._flags.is_set(self._bit)
+
+    def set(self):
+        """Set the state and wake up all the waiters"""
+        self._flags.set(self._bit)
+
+    def clear(self):
+        """Clear the state"""
+        self._flags.clear(self._bit)
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until the state is set
+
+        :param timeout: the timeout in seconds, wait forever if it is None
+        :return: True if the state is set before the timeout
+        """
+        return self._flags.wait_any(self._bit, timeout)
@@ -0,0 +1,85 @@
+import multiprocessing
+import threading
+
+import pytest
+
+from jina.enums import RuntimeBackendType
+from jina.peapods.peas.helper import _PeaStateFlags, _get_event
+
+
+@pytest.mark.parametrize(
+    'backend',
+    [
+        RuntimeBackendType.THREAD,
+        RuntimeBackendType.PROCESS,
+        multiprocessing.get_context('spawn').Process,
+    ],
+)
+def test_pea_state_flags(backend):
+    flags = _PeaStateFlags(backend)
+    any_state = _PeaStateFlags.READY | _PeaStateFlags.SHUTDOWN
+    assert not flags.is_set(any_state)
+    assert not flags.wait_any(any_state, 0.1)
+
+    flags.set(_PeaStateFlags.READY)
+    assert flags.wait_any(any_state, 0.1)
+    assert not flags.is_set(_PeaStateFlags.SHUTDOWN)
+    flags.set(_PeaStateFlags.SHUTDOWN)
+    flags.clear(_PeaStateFlags.READY)
+    assert flags.is_set(any_state)
+    assert not flags.is_set(_PeaStateFlags.READY)
+    flags.clear()
+    assert not flags.wait_any(any_state, 0.1)
+
+
+def test_pea_state_event():
+    flags = _PeaStateFlags(RuntimeBackendType.THREAD)
+    is_ready = flags.event(_PeaStateFlags.READY)
+    is_shutdown = flags.event(_PeaStateFlags.SHUTDOWN)
+
+    threading.Timer(0.1, is_ready.set).start()
+    assert is_ready.wait(5)
+    assert flags.is_set(_PeaStateFlags.READY)
+    assert not is_shutdown.is_set()
+    is_ready.clear()
+    assert not flags.is_set(_PeaStateFlags.READY)
+
+
+@pytest.mark.parametrize('start_method', ['fork', 'spawn'])
+def test_pea_state_flags_set_in_process(start_method):
+    ctx = multiprocessing.get_context(start_method)
+    flags = _PeaStateFlags(ctx.Process)
+
+    p = ctx.Process(target=flags.set, args=(_PeaStateFlags.SHUTDOWN,))
+    p.start()
+    assert flags.wait_any(_PeaStateFlags.READY | _PeaStateFlags.SHUTDOWN, 30)
+    assert flags.is_set(_PeaStateFlags.SHUTDOWN)
+    p.join()
+
+    # the views are shared with the spawned processes as well
+    p = ctx.Process(target=flags.event(_PeaStateFlags.READY).set)
+    p.start()
+    assert flags.event(_PeaStateFlags.READY).wait(30)
+    p.join()
+
+
+@pytest.mark.parametrize(
+    'backend, event_cls',
+    [
+        (RuntimeBackendType.THREAD, threading.Event),
+        (threading.Thread, threading.Event),
+        (
+            multiprocessing.get_context('spawn').Process,
+            type(multiprocessing.get_context('spawn').Event()),
+        ),
+    ],
+)
+def test_get_event(backend, event_cls):
+    assert isinstance(_get_event(backend), event_cls)
+
+
+def test_get_event_wrong_backend():
+    with pytest.raises(TypeError):
+        _get_event(threading.Thread())
+    with pytest.raises(TypeError):
+        _PeaStateFlags(threading.Thread())
@@ -1,4 +1,7 @@
 import os
+import subprocess
+import sys
+import threading
 import time
 
 import pytest
@@ -8,6 +11,7 @@ from jina.excepts import RuntimeFailToStart, RuntimeRunForeverEarlyError
 from jina.executors import BaseExecutor
 from jina.parsers import set_gateway_parser, set_pea_parser
 from jina.peapods import Pea
+from jina.peapods.peas import close_many
 from jina.peapods.runtimes.zmq.zed import ZEDRuntime
 from jina.types.message.common import ControlMessage
 
@@ -265,3 +269,222 @@ def test_idle_does_not_create_response(command, response_expected):
             socket.connect(f'tcp://localhost:{p.args.port_ctrl}')
             socket.send_multipart(msg.dump())
             assert socket.poll(timeout=1000) == response_expected
+
+
+def test_pea_process_pool_reuses_process(monkeypatch):
+    monkeypatch.setenv('JINA_PEA_PROCESS_POOL', '1')
+    args = set_pea_parser().parse_args(['--runtime-backend', 'process'])
+
+    pids = []
+    for _ in range(2):
+        p = Pea(args)
+        # the pooled process is only acquired on start
+        assert p.worker.pid is None
+        with p:
+            pids.append(p.worker.pid)
+            assert p.is_ready.is_set()
+
+    assert pids[0] == pids[1]
+
+
+@pytest.mark.parametrize('daemon', [False, True])
+def test_pea_process_pool_exits_after_failed_start(daemon):
+    code = (
+        'from jina.excepts import RuntimeFailToStart\n'
+        'from jina.parsers import set_pea_parser\n'
+        'from jina.peapods import Pea\n'
+        'args = ["--runtime-backend", "process", "--uses", "NonExisting"]\n'
+        f'args += {["--daemon"] if daemon else []}\n'
+        'try:\n'
+        '    with Pea(set_pea_parser().parse_args(args)):\n'
+        '        pass\n'
+        'except RuntimeFailToStart:\n'
+        '    pass\n'
+    )
+    env = {**os.environ, 'JINA_PEA_PROCESS_POOL': '1'}
+    subprocess.run([sys.executable, '-c', code], env=env, check=True, timeout=60)
+
+
+@pytest.fixture
+def run_idents(monkeypatch):
+    from jina.peapods import peas
+
+    idents = []
+    _run = peas.run
+
+    def run(*args, **kwargs):
+        idents.append(threading.get_ident())
+        return _run(*args, **kwargs)
+
+    monkeypatch.setattr(peas, 'run', run)
+    return idents
+
+
+def test_pea_thread_pool_reuses_thread(run_idents):
+    from jina.peapods import peas
+
+    args = set_pea_parser().parse_args(['--runtime-backend', 'thread'])
+
+    num_threads = []
+    for _ in range(3):
+        with Pea(args) as p:
+            assert p.worker._future
+            assert p.worker.is_alive()
+        assert not p.worker.is_alive()
+        num_threads.append(len(peas._THREAD_POOL._threads))
+        # the pool thread is marked idle right after the future is done
+        time.sleep(0.1)
+
+    assert num_threads[0] == num_threads[-1]
+    assert set(run_idents) <= {t.ident for t in peas._THREAD_POOL._threads}
+
+
+def test_pea_thread_pool_falls_back_to_thread(monkeypatch, run_idents):
+    from jina.peapods import peas
+
+    monkeypatch.setattr(peas, '_thread_pool_busy', peas._THREAD_POOL_MAX_WORKERS)
+    args = set_pea_parser().parse_args(['--runtime-backend', 'thread'])
+
+    with Pea(args) as p:
+        assert p.worker._future is None
+        assert isinstance(p.worker._thread, threading.Thread)
+        assert run_idents == [p.worker._thread.ident]
+    assert not p.worker.is_alive()
+
+
+@pytest.mark.parametrize('uses', ['jinahub://dummy', 'JinaHub+Docker://dummy'])
+def test_hub_uri_case_insensitive(mocker, uses):
+    is_valid = mocker.patch('jina.hubble.helper.is_valid_huburi', return_value=False)
+    Pea(set_pea_parser().parse_args(['--uses', uses]))
+    is_valid.assert_called_once_with(uses)
+
+
+def test_retry_control_message_backoff(mocker):
+    p = Pea(set_pea_parser().parse_args([]))
+    send_spy = mocker.patch(
+        'jina.peapods.zmq.send_ctrl_message', side_effect=TimeoutError
+    )
+    sleep_spy = mocker.patch('jina.peapods.peas.time.sleep')
+
+    with pytest.raises(TimeoutError):
+        p._retry_control_message('STATUS')
+    assert send_spy.call_count == 3
+    assert [c.args[0] for c in sleep_spy.call_args_list] == [0.05, 0.1]
+
+    # no more retries once the runtime is shutdown
+    send_spy.reset_mock()
+    p.is_shutdown.set()
+    p._retry_control_message('STATUS')
+    send_spy.assert_called_once()
+
+
+def test_ctrl_address_cache():
+    from jina.peapods.peas import _get_ctrl_address
+
+    assert _get_ctrl_address('0.0.0.0', 12345, False) == 'tcp://0.0.0.0:12345'
+    assert _get_ctrl_address('user@1.2.3.4', 12345, False) == 'tcp://1.2.3.4:12345'
+    if os.name != 'nt':
+        # ipc addresses are random and must never be shared
+        assert _get_ctrl_address('0.0.0.0', 12345, True) != _get_ctrl_address(
+            '0.0.0.0', 12345, True
+        )
+
+
+@pytest.mark.parametrize('runtime', ['thread', 'process'])
+def test_close_many(runtime):
+    peas = [
+        Pea(set_pea_parser().parse_args(['--runtime-backend', runtime])).start()
+        for _ in range(3)
+    ]
+    assert all(p.is_ready.is_set() for p in peas)
+
+    close_many(peas, timeout=10)
+    assert all(p.is_shutdown.is_set() for p in peas)
+    assert not any(p.worker.is_alive() for p in peas)
+
+
+def test_close_many_closes_all_on_error(mocker):
+    peas = [mocker.Mock() for _ in range(3)]
+    peas[0].close_wait.side_effect = ValueError
+
+    with pytest.raises(ValueError):
+        close_many(peas, timeout=1)
+    for p in peas:
+        p.close_wait.assert_called_once()
+
+
+def test_close_many_deadline_not_ready():
+    args = ['--runtime-backend', 'thread', '--timeout-ready', '60000']
+    p = Pea(set_pea_parser().parse_args(args))
+
+    start = time.monotonic()
+    close_many([p], timeout=0.5)
+    assert time.monotonic() - start < 5
+
+
+@pytest.mark.skipif(
+    sys.platform == 'win32', reason='forkserver is not available on windows'
+)
+def test_pea_with_forkserver():
+    code = (
+        'from jina.parsers import set_pea_parser\n'
+        'from jina.peapods import Pea\n'
+        'with Pea(set_pea_parser().parse_args(["--runtime-backend", "process"])) as p:\n'
+        '    assert p.worker._start_method == "forkserver"\n'
+    )
+    subprocess.run(
+        [sys.executable, '-c', code],
+        env={**os.environ, 'JINA_MP_START_METHOD': 'forkserver'},
+        check=True,
+        timeout=60,
+    )
+
+
+@pytest.mark.parametrize('quiet_error', [False, True])
+def test_run_logs_bad_init(mocker, quiet_error):
+    from jina.peapods.peas import run
+    from jina.peapods.peas.helper import _PeaStateFlags
+
+    args = set_pea_parser().parse_args(
+        ['--runtime-backend', 'thread'] + (['--quiet-error'] if quiet_error else [])
+    )
+    logger = mocker.Mock()
+    state = _PeaStateFlags()
+    run(
+        args=args,
+        name='pea',
+        runtime_cls=bad_func,
+        envs={},
+        timeout_ctrl=args.timeout_ctrl,
+        zed_runtime_ctrl_address='',
+        state=state,
+        logger=logger,
+    )
+
+    assert state.is_set(_PeaStateFlags.SHUTDOWN)
+    assert not state.is_set(_PeaStateFlags.STARTED)
+    msg = logger.error.call_args.args[0]
+    assert 'intentional error' in msg
+    assert ('--quiet-error' in msg) != quiet_error
+
+
+def test_base_pea_has_no_dict():
+    from jina.peapods.peas import BasePea
+
+    with BasePea(set_pea_parser().parse_args(['--runtime-backend', 'thread'])) as p:
+        assert not hasattr(p, '__dict__')
+        assert p.is_ready.is_set()
+
+
+@pytest.mark.parametrize('start_method', [None, 'no-such-method'])
+def test_import_keeps_start_method_undecided(start_method):
+    code = (
+        'import multiprocessing\n'
+        'import jina.peapods.peas\n'
+        'assert multiprocessing.get_start_method(allow_none=True) is None\n'
+        'multiprocessing.set_start_method("spawn")\n'
+    )
+    env = {k: v for k, v in os.environ.items() if k != 'JINA_MP_START_METHOD'}
+    if start_method:
+        env['JINA_MP_START_METHOD'] = start_method
+    subprocess.run([sys.executable, '-c', code], env=env, check=True, timeout=60)
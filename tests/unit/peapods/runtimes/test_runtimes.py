@@ -1,13 +1,12 @@
 import multiprocessing
 import os
-import threading
 
 import pytest
 
 from jina.excepts import RuntimeFailToStart
 from jina.parsers import set_pea_parser, set_gateway_parser
 from jina.peapods import Pea
-from jina.peapods.peas import BasePea
+from jina.peapods.peas import BasePea, _ThreadFutureWorker
 from jina.peapods.runtimes.gateway.grpc import GRPCRuntime
 from jina.peapods.runtimes.gateway.websocket import WebSocketRuntime
 from jina.peapods.runtimes.container import ContainerRuntime
@@ -25,7 +24,7 @@ def test_zed_runtime(runtime, ctrl_ipc):
     )
     with Pea1(arg) as p:
         if runtime == 'thread':
-            assert isinstance(p.worker, threading.Thread)
+            assert isinstance(p.worker, _ThreadFutureWorker)
         elif runtime == 'process':
             assert isinstance(p.worker, multiprocessing.Process)
 